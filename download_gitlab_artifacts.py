@@ -3,174 +3,481 @@ import argparse
 import os
 import zipfile
 import json
+import re
+import hashlib
+import io
+import multiprocessing
+import threading
 import shutil
+import tempfile
 import urllib3
-import html
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from reportlab.lib.pagesizes import A4
-from reportlab.platypus import XPreformatted, SimpleDocTemplate, Paragraph
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_LEFT
-from concurrent.futures import ThreadPoolExecutor
+from reportlab.lib.units import cm
+from reportlab.pdfgen import canvas
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 import xml.etree.ElementTree as ET
 
+try:
+    import orjson  # Optional, much faster JSON parsing and pretty-printing
+except ImportError:
+    orjson = None
+
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# Read size for streamed artifact downloads; large chunks keep per-chunk Python overhead low
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Records the source file hash and reports ZIP entry of every generated PDF for --incremental runs
+MANIFEST_FILENAME = '.manifest.json'
+
+# Process pool for CPU-bound PDF conversion, created in main()
+_PDF_POOL = None
+
+# Page layout for generated PDFs
+PDF_MARGIN = 2 * cm
+PDF_FONT_SIZE = 10
+PDF_LEADING = 12
+# Courier glyphs are 0.6 em wide, so a fixed character count fills the text width
+PDF_LINE_CHARS = int((A4[0] - 2 * PDF_MARGIN) / (0.6 * PDF_FONT_SIZE))
+
+def _is_plain_filename(name):
+    """Tells whether an archive entry name is a bare file name that can't point outside the extract directory"""
+    if name in ('', '.', '..') or os.path.basename(name) != name or os.path.splitdrive(name)[0]:
+        return False
+    return not any(sep and sep in name for sep in ('/', '\\', os.sep, os.altsep))
+
 class PipelineArtifactFetcher:
-    def __init__(self, base_url, token):
+    def __init__(self, base_url, token, pool_size=32):
         self.base_url = base_url.rstrip('/')
-        self.headers = {'PRIVATE-TOKEN': token}
+        # One session per fetcher so connections and TLS state are reused across requests
+        self.session = requests.Session()
+        # Only add the token; the default 'Accept-Encoding: gzip, deflate' keeps the job list responses compressed
+        self.session.headers.update({'PRIVATE-TOKEN': token})
+        self.session.verify = False
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                              max_retries=Retry(total=3, backoff_factor=0.3))
+        self.session.mount('https://', adapter)
 
-    def get_job_id(self, project_id, pipeline_id, job_name):
-        """Gets the job ID for a given job name in a specific pipeline, iterating over paginated results"""
+    def get_job_ids(self, project_id, pipeline_id, job_names):
+        """Gets the job IDs for the given job names in a specific pipeline with a single pass over the paginated results.
+        Names without a matching job are missing from the returned dict"""
+        wanted = set(job_names)
+        job_ids = {}
         page = 1
         while True:
             url = f"{self.base_url}/projects/{project_id}/pipelines/{pipeline_id}/jobs?per_page=100&page={page}"
-            response = requests.get(url, headers=self.headers, verify=False)
+            response = self.session.get(url)
             response.raise_for_status()
-            jobs = response.json()
-            for job in jobs:
-                if job['name'] == job_name:
-                    return job['id']
+            for job in response.json():
+                # Keep the first match, as the original lookup did for retried jobs
+                if job['name'] in wanted and job['name'] not in job_ids:
+                    job_ids[job['name']] = job['id']
             next_page = response.headers.get('X-Next-Page')
-            if not next_page:
+            if not next_page or len(job_ids) == len(wanted):
                 break
             page = int(next_page)
-        raise ValueError(f"Job '{job_name}' not found")
+        return job_ids
 
-    def download_artifact(self, project_id, job_id):
-        """Downloads artifacts for a specific job ID and returns the path to the downloaded zip file"""
+    def download_and_extract(self, project_id, job_id, extract_dir, extensions):
+        """Downloads artifacts for a specific job ID and extracts them to extract_dir without an intermediate zip file.
+        Previous contents of extract_dir are removed. Only top-level files with one of the given (lowercase) extensions are extracted"""
         url = f"{self.base_url}/projects/{project_id}/jobs/{job_id}/artifacts"
-        response = requests.get(url, headers=self.headers, verify=False, stream=True)
-        response.raise_for_status()
-        output_filename = f"job_{job_id}_artifacts.zip"
-        with open(output_filename, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-        return output_filename
+        # Small archives stay in memory, larger ones spill over to a temporary file
+        with self.session.get(url, stream=True) as response, \
+                tempfile.SpooledTemporaryFile(max_size=64 * 1024 * 1024) as tmp:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            shutil.copyfileobj(response.raw, tmp, length=DOWNLOAD_CHUNK_SIZE)
+            tmp.seek(0)
+            # Start from an empty directory so files dropped from the artifacts since an earlier run don't linger
+            shutil.rmtree(extract_dir, ignore_errors=True)
+            os.makedirs(extract_dir, exist_ok=True)
+            with zipfile.ZipFile(tmp) as zip_ref:
+                # One copy buffer is shared by all entries instead of a fresh one per extracted file
+                buffer = memoryview(bytearray(DOWNLOAD_CHUNK_SIZE))
+                for info in zip_ref.infolist():
+                    name = info.filename
+                    if not _is_plain_filename(name) or not name.lower().endswith(extensions):
+                        continue
+                    with zip_ref.open(info) as src, open(os.path.join(extract_dir, name), 'wb') as dst:
+                        while size := src.readinto(buffer):
+                            dst.write(buffer[:size])
+        return extract_dir
 
 def clean_output_dir(output_dir):
     """Removes all contents of output_dir, if it exists"""
-    if os.path.exists(output_dir):
-        shutil.rmtree(output_dir)
-
-def unzip_to_dir(zip_path, extract_dir):
-    """Unzips artifacts to directory (no renaming)"""
-    if not os.path.exists(extract_dir):
-        os.makedirs(extract_dir)
-    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        zip_ref.extractall(extract_dir)
-    os.remove(zip_path)
-    return extract_dir
-
-def json_to_pdf(json_path, pdf_path):
+    shutil.rmtree(output_dir, ignore_errors=True)
+
+def load_manifest(output_dir):
+    """Loads the PDF manifest of output_dir, or returns an empty one if there is none"""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_FILENAME), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(output_dir, manifest):
+    """Writes the PDF manifest to output_dir"""
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, MANIFEST_FILENAME), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+def _file_sha256(path):
+    """Returns the hex SHA-256 digest of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _begin_text(pdf, y):
+    """Starts a monospaced text object at the left margin and height y"""
+    text = pdf.beginText(PDF_MARGIN, y)
+    text.setFont('Courier', PDF_FONT_SIZE)
+    text.setLeading(PDF_LEADING)
+    return text
+
+def _text_to_pdf(lines, output, title):
+    """Draws lines of text onto A4 pages below a title, wrapping long lines and adding pages as needed.
+    output is a file path or a binary file object"""
+    _, height = A4
+    pdf = canvas.Canvas(output, pagesize=A4)
+    pdf.setFont('Helvetica-Bold', 14)
+    pdf.drawString(PDF_MARGIN, height - PDF_MARGIN, title)
+    text_obj = _begin_text(pdf, height - PDF_MARGIN - cm)
+    for line in lines:
+        for start in range(0, max(len(line), 1), PDF_LINE_CHARS):
+            if text_obj.getY() < PDF_MARGIN:
+                pdf.drawText(text_obj)
+                pdf.showPage()
+                text_obj = _begin_text(pdf, height - PDF_MARGIN)
+            text_obj.textLine(line[start:start + PDF_LINE_CHARS])
+    pdf.drawText(text_obj)
+    pdf.save()
+    return output
+
+# orjson turns integer literals beyond 64 bits into floats, so documents containing such long digit runs skip it
+_LONG_DIGITS = re.compile(rb'\d{19,}')
+_NON_ASCII = re.compile('[^\x00-\x7f]+')
+
+def _pretty_json(raw):
+    """Pretty-prints raw JSON bytes with an indent of 2 and non-ASCII characters escaped, like json.dumps(indent=2).
+    orjson is only used where it parses the input losslessly; everything else goes through the stdlib"""
+    if orjson and not _LONG_DIGITS.search(raw):
+        try:
+            json_str = orjson.dumps(orjson.loads(raw), option=orjson.OPT_INDENT_2).decode()
+        except (orjson.JSONDecodeError, orjson.JSONEncodeError):
+            pass  # e.g. NaN/Infinity, which the stdlib parser accepts
+        else:
+            # The standard PDF fonts can't draw non-ASCII text, so keep the \uXXXX escapes json.dumps produces
+            return _NON_ASCII.sub(lambda m: json.dumps(m.group())[1:-1], json_str)
+    return json.dumps(json.loads(raw), indent=2)
+
+def json_to_pdf(json_path, output):
     """Converts JSON file to PDF, preserving structure and indentation"""
-    with open(json_path, 'r') as f:
-        json_data = json.load(f)
-    json_str = json.dumps(json_data, indent=2)
-    doc = SimpleDocTemplate(pdf_path, pagesize=A4)
-    styles = getSampleStyleSheet()
-    monospace = ParagraphStyle(
-        name='Monospace',
-        parent=styles['Normal'],
-        fontName='Courier',
-        fontSize=10,
-        alignment=TA_LEFT,
-        leading=14,
-        spaceBefore=6,
-        spaceAfter=6
-    )
-    elements = []
-    title = Paragraph(os.path.basename(json_path), styles['Title'])
-    elements.append(title)
-
-    for line in json_str.split('\n'):
-        # To preserve indentation: use non-breaking spaces for leading spaces (optional)
-        # This is not strictly necessary for most monospace fonts, but ensures perfect alignment
-        leading_spaces = len(line) - len(line.lstrip(' '))
-        if leading_spaces > 0:
-            line = '&nbsp;' * leading_spaces + line[leading_spaces:]
-        elements.append(Paragraph(line, monospace))
-    doc.build(elements)
-
-def xml_to_pdf(xml_path, pdf_path):
+    with open(json_path, 'rb') as f:
+        json_str = _pretty_json(f.read())
+    return _text_to_pdf(json_str.splitlines(), output, os.path.basename(json_path))
+
+# Bound to the xml prefix implicitly, so the parser never reports it as a namespace declaration
+XML_NAMESPACE = 'http://www.w3.org/XML/1998/namespace'
+
+def _escape_xml_text(text):
+    """Escapes character data for XML output"""
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+def _escape_xml_attr(value):
+    """Escapes an attribute value for XML output inside double quotes"""
+    return _escape_xml_text(value).replace('"', '&quot;').replace('\n', '&#10;').replace('\t', '&#09;')
+
+def _iter_xml_chunks(xml_path):
+    """Serializes an XML file piece by piece while parsing it incrementally.
+    Finished elements are cleared and detached from their parent, so memory grows with the nesting depth
+    rather than with the document size"""
+    scopes = []  # (prefix, uri) bindings declared by each currently open element
+    parents = []  # Currently open elements
+    declared = []
+    open_elem = None  # Element whose start tag is not terminated yet
+    closed_elem = None  # Element whose tail has not been written yet
+    closed_parent = None
+
+    def bound_uri(prefix):
+        for scope in reversed(scopes):
+            for bound_prefix, uri in scope:
+                if bound_prefix == prefix:
+                    return uri
+        return None
+
+    def qname(name, attribute=False):
+        if name[:1] != '{':
+            return name
+        uri, local = name[1:].split('}', 1)
+        if uri == XML_NAMESPACE:
+            return f"xml:{local}"
+        # Use the innermost prefix that is still bound to the namespace here; attributes need a non-empty one,
+        # since unprefixed attributes never belong to a namespace
+        for scope in reversed(scopes):
+            for prefix, bound in scope:
+                if bound == uri and (prefix or not attribute) and bound_uri(prefix) == uri:
+                    return f"{prefix}:{local}" if prefix else local
+        return local
+
+    for event, item in ET.iterparse(xml_path, events=('start-ns', 'start', 'end')):
+        if event == 'start-ns':
+            declared.append(item)
+            continue
+        # The text and tail of an element are only complete once the parser has moved past them
+        if closed_elem is not None:
+            if closed_elem.tail:
+                yield _escape_xml_text(closed_elem.tail)
+            closed_elem.clear()
+            if closed_parent is not None:
+                closed_parent.remove(closed_elem)
+            closed_elem = None
+        if event == 'start':
+            if open_elem is not None:
+                yield '>' + _escape_xml_text(open_elem.text or '')
+            scopes.append(declared)
+            parents.append(item)
+            attrs = ''.join(f' xmlns:{prefix}="{_escape_xml_attr(uri)}"' if prefix
+                            else f' xmlns="{_escape_xml_attr(uri)}"' for prefix, uri in declared)
+            attrs += ''.join(f' {qname(key, attribute=True)}="{_escape_xml_attr(value)}"'
+                             for key, value in item.attrib.items())
+            declared = []
+            yield f"<{qname(item.tag)}{attrs}"
+            open_elem = item
+        else:
+            if open_elem is item:
+                yield f">{_escape_xml_text(item.text)}</{qname(item.tag)}>" if item.text else ' />'
+            else:
+                yield f"</{qname(item.tag)}>"
+            scopes.pop()
+            parents.pop()
+            open_elem = None
+            closed_elem = item
+            closed_parent = parents[-1] if parents else None
+    if closed_elem is not None:
+        closed_elem.clear()
+
+def _iter_lines(chunks):
+    """Joins text chunks and yields them split into lines"""
+    pending = []
+    for chunk in chunks:
+        if '\n' not in chunk:
+            pending.append(chunk)
+            continue
+        first, *middle, last = chunk.split('\n')
+        pending.append(first)
+        yield ''.join(pending)
+        yield from middle
+        pending = [last]
+    yield ''.join(pending)
+
+def xml_to_pdf(xml_path, output):
     """Converts XML file to PDF, preserving structure, indentation, and wrapping lines"""
     try:
-        tree = ET.parse(xml_path)
-        root = tree.getroot()
-        xml_str = ET.tostring(root, encoding='unicode', method='xml')
-
-        doc = SimpleDocTemplate(pdf_path, pagesize=A4)
-        styles = getSampleStyleSheet()
-        monospace = ParagraphStyle(
-            name='Monospace',
-            parent=styles['Normal'],
-            fontName='Courier',
-            fontSize=10,
-            alignment=TA_LEFT,
-            leading=14,
-            spaceBefore=6,
-            spaceAfter=6,
-            wordWrap='LTR'  # Ensures lines are wrapped properly
-        )
-        elements = []
-        title = Paragraph(html.escape(os.path.basename(xml_path)), styles['Title'])
-        elements.append(title)
-
-        for line in xml_str.split('\n'):
-            escaped_line = html.escape(line)
-            elements.append(Paragraph(escaped_line, monospace))
-        doc.build(elements)
+        return _text_to_pdf(_iter_lines(_iter_xml_chunks(xml_path)), output, os.path.basename(xml_path))
     except ET.ParseError as e:
         print(f"❌ XML parsing error: {str(e)}")
     except Exception as e:
         print(f"❌ Failed to convert XML to PDF: {str(e)}")
 
-def zip_pdfs(output_dir, zip_filename="reports.zip", pdf_prefix=""):
-    """Zips all PDF files in output_dir and its subdirectories, placing them at the root of the ZIP"""
-    pdf_files = []
-    for root, _, files in os.walk(output_dir):
-        for file in files:
-            if file.lower().endswith('.pdf'):
-                pdf_files.append(os.path.join(root, file))
-    if not pdf_files:
-        print("⚠️ No PDF files found to zip.\n")
-        return
-    zip_path = os.path.join(output_dir, f"{pdf_prefix}{zip_filename}")
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for pdf_file in pdf_files:
-            arcname = f"{pdf_prefix}{os.path.basename(pdf_file)}"
-            zipf.write(pdf_file, arcname)
-    print(f"✅ Zipped all PDFs to {zip_path}\n")
-
-def process_job(job_name, base_url, token, project_id, pipeline_id, output_dir):
-    """Processes a single job: fetches artifacts, unzips them, converts JSON to PDF"""
+# Maps lowercased file extensions to the function converting such files to PDF
+PDF_CONVERTERS = {
+    '.json': json_to_pdf,
+    '.xml': xml_to_pdf
+}
+
+def render_pdf(converter, source_path):
+    """Runs a converter into memory and returns the PDF bytes, or None if the conversion failed"""
+    buffer = io.BytesIO()
     try:
-        fetcher = PipelineArtifactFetcher(base_url, token)
-        job_id = fetcher.get_job_id(project_id, pipeline_id, job_name)
-        zip_path = fetcher.download_artifact(project_id, job_id)
-        print(f"📦 Downloaded artifacts for {job_name} to {zip_path}")
+        if converter(source_path, buffer) is None:
+            return None
+    except Exception as e:
+        print(f"❌ Failed to convert {os.path.basename(source_path)} to PDF: {str(e)}")
+        return None
+    return buffer.getvalue()
+
+class ReportsArchive:
+    """Thread-safe writer for the reports ZIP of one pipeline, which is created when the first PDF is added.
+    In incremental mode, PDFs of unchanged source files are copied over from the previous ZIP"""
+
+    def __init__(self, output_dir, pdf_prefix="", zip_filename="reports.zip", incremental=False):
+        self.output_dir = output_dir
+        self.pdf_prefix = pdf_prefix
+        self.zip_path = os.path.join(output_dir, f"{pdf_prefix}{zip_filename}")
+        self.incremental = incremental
+        self._lock = threading.Lock()
+        self._zipf = None
+        self._previous = None
+        self._previous_manifest = {}
+        self._manifest = {}
+        if incremental and os.path.exists(self.zip_path):
+            self._previous = zipfile.ZipFile(self.zip_path, 'r')
+            self._previous_manifest = load_manifest(output_dir)
+
+    def _write(self, arcname, data):
+        """Appends an entry to the new ZIP and returns its index; the caller holds the lock"""
+        if self._zipf is None:
+            os.makedirs(self.output_dir, exist_ok=True)
+            # PDFs barely compress, so they are stored as-is instead of spending CPU on deflate
+            self._zipf = zipfile.ZipFile(self.zip_path + '.tmp', 'w', zipfile.ZIP_STORED, allowZip64=True)
+        self._zipf.writestr(arcname, data)
+        return len(self._zipf.infolist()) - 1
+
+    def add(self, pdf_name, data, source_key=None, source_hash=None):
+        """Adds a PDF at the root of the ZIP and records the hash of its source file"""
+        with self._lock:
+            index = self._write(f"{self.pdf_prefix}{pdf_name}", data)
+            if source_key is not None:
+                self._manifest[source_key] = {'sha256': source_hash, 'entry': index}
+
+    def reuse(self, pdf_name, source_key, source_hash):
+        """Copies a PDF from the previous ZIP if its source file is unchanged and returns whether it did"""
+        arcname = f"{self.pdf_prefix}{pdf_name}"
+        with self._lock:
+            if self._previous is None:
+                return False
+            previous = self._previous_manifest.get(source_key)
+            if not isinstance(previous, dict) or previous.get('sha256') != source_hash:
+                return False
+            # Look the entry up by position: several jobs may produce PDFs with the same archive name
+            entries = self._previous.infolist()
+            index = previous.get('entry')
+            if not isinstance(index, int) or not 0 <= index < len(entries) or entries[index].filename != arcname:
+                return False
+            index = self._write(arcname, self._previous.read(entries[index]))
+            self._manifest[source_key] = {'sha256': source_hash, 'entry': index}
+            return True
 
+    def close(self):
+        """Finishes the ZIP, replacing the previous one, and stores the manifest in incremental mode"""
+        if self._previous is not None:
+            self._previous.close()
+        if self._zipf is None:
+            # Don't leave the reports of an earlier run behind as if they were current
+            for path in (self.zip_path, os.path.join(self.output_dir, MANIFEST_FILENAME)):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            print("⚠️ No PDF files found to zip.\n")
+            return
+        self._zipf.close()
+        os.replace(self.zip_path + '.tmp', self.zip_path)
+        if self.incremental:
+            save_manifest(self.output_dir, self._manifest)
+        print(f"✅ Zipped all PDFs to {self.zip_path}\n")
+
+def process_job(job_name, job_id, fetcher, project_id, output_dir, archive):
+    """Processes a single job: fetches artifacts, unzips them, converts JSON/XML to PDF and adds the PDFs to archive.
+    In incremental mode, files whose PDF was already generated from identical content are not converted again"""
+    try:
         extract_dir = os.path.join(output_dir, f"job_{job_id}")
-        unzip_to_dir(zip_path, extract_dir)
-        for filename in os.listdir(extract_dir):
-            if filename.endswith('.json'):
-                json_path = os.path.join(extract_dir, filename)
-                pdf_path = os.path.splitext(json_path)[0] + '.pdf'
-                json_to_pdf(json_path, pdf_path)
-            elif filename.endswith('.xml'):
-                xml_path = os.path.join(extract_dir, filename)
-                pdf_path = os.path.splitext(xml_path)[0] + '.pdf'
-                xml_to_pdf(xml_path, pdf_path)
+        fetcher.download_and_extract(project_id, job_id, extract_dir, tuple(PDF_CONVERTERS))
+        print(f"📦 Downloaded artifacts for {job_name} to {extract_dir}")
+
+        conversions = {}
+        for entry in os.scandir(extract_dir):
+            if not entry.is_file():
+                continue
+            name = entry.name
+            converter = PDF_CONVERTERS.get(name[name.rfind('.'):].lower())
+            if converter:
+                pdf_name = os.path.splitext(name)[0] + '.pdf'
+                source_key = os.path.relpath(entry.path, output_dir)
+                source_hash = None
+                if archive.incremental:
+                    source_hash = _file_sha256(entry.path)
+                    if archive.reuse(pdf_name, source_key, source_hash):
+                        continue
+                # PDF generation is CPU-bound, so it runs in worker processes rather than this thread
+                conversion = _PDF_POOL.submit(render_pdf, converter, entry.path)
+                conversions[conversion] = (pdf_name, source_key, source_hash)
+        # Only the append to the ZIP is serialized; each PDF is added as soon as its worker is done with it
+        for conversion in as_completed(conversions):
+            pdf_name, source_key, source_hash = conversions[conversion]
+            data = conversion.result()
+            if data is not None:
+                archive.add(pdf_name, data, source_key, source_hash)
         return True
     except Exception as e:
         print(f"❌ Failed to process {job_name}: {str(e)}")
         return False
 
+def process_configs(configs, base_url, token, output_root, incremental=False):
+    """Processes the jobs of all config entries concurrently and zips the PDFs of each pipeline once its jobs are done.
+    In incremental mode existing output is kept and only changed files are converted again"""
+    groups = {}
+    for config in configs:
+        key = (config['project_id'], config['pipeline_id'])
+        output_dir = os.path.join(output_root, f"project_{key[0]}_pipeline_{key[1]}")
+        if key not in groups:
+            if not incremental:
+                clean_output_dir(output_dir)
+            archive = ReportsArchive(output_dir, pdf_prefix=config['pdf_prefix'], incremental=incremental)
+            groups[key] = {'output_dir': output_dir, 'archive': archive, 'job_names': [], 'pending': 0}
+        groups[key]['job_names'].extend(config['job_names'])
+    for group in groups.values():
+        # A job listed twice would have two threads sharing (and wiping) one extract directory
+        group['job_names'] = list(dict.fromkeys(group['job_names']))
+
+    # Size the pool to the workload and let the HTTP connection pool match it
+    workers = max(4, min(32, sum(len(group['job_names']) for group in groups.values())))
+    fetcher = PipelineArtifactFetcher(base_url, token, pool_size=workers)
+
+    # Resolve all job names of a pipeline at once instead of paging through its jobs for every name
+    all_jobs = []
+    for key, group in groups.items():
+        try:
+            job_ids = fetcher.get_job_ids(key[0], key[1], group['job_names'])
+        except Exception as e:
+            print(f"❌ Failed to fetch jobs of pipeline {key[1]}: {str(e)}")
+        else:
+            for job_name in group['job_names']:
+                if job_name in job_ids:
+                    all_jobs.append((key, job_name, job_ids[job_name]))
+                    group['pending'] += 1
+                else:
+                    print(f"❌ Failed to process {job_name}: Job '{job_name}' not found")
+        if group['pending'] == 0:
+            group['archive'].close()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for key, job_name, job_id in all_jobs:
+            group = groups[key]
+            future = executor.submit(process_job, job_name, job_id, fetcher, key[0], group['output_dir'],
+                                     group['archive'])
+            futures[future] = (key, job_name)
+        try:
+            # Drain results in completion order so each pipeline is zipped as soon as its last job is done
+            for future in as_completed(futures):
+                key, job_name = futures[future]
+                group = groups[key]
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"❌ Failed to process {job_name}: {str(e)}")
+                group['pending'] -= 1
+                if group['pending'] == 0:
+                    group['archive'].close()
+        except BaseException:
+            # Don't start queued downloads after a fatal error or an interrupt
+            executor.shutdown(cancel_futures=True)
+            raise
+
 def main():
     """Main function to parse arguments and process artifacts"""
+    global _PDF_POOL
     parser = argparse.ArgumentParser(description='Fetch and process CI/CD artifacts')
     parser.add_argument('--output-dir', default='artifacts', help='Output directory')
     parser.add_argument('--config', required=True, help='Path to config file (JSON)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Keep existing output and only convert files that changed since the last run')
     args = parser.parse_args()
 
     token = os.getenv('GITLAB_TOKEN')
@@ -197,20 +504,12 @@ def main():
         print(f"Error reading config file: {e}")
         exit(1)
 
-    for config in configs:
-        project_id = config['project_id']
-        pipeline_id = config['pipeline_id']
-        pdf_prefix = config['pdf_prefix']
-        job_names = config['job_names']
-        output_dir = os.path.join(args.output_dir, f"project_{project_id}_pipeline_{pipeline_id}")
-        clean_output_dir(output_dir)
-        job_args = [(job_name, base_url, token, project_id, pipeline_id, output_dir)
-                    for job_name in job_names]
-        with ThreadPoolExecutor() as executor:
-            futures = [executor.submit(process_job, *args) for args in job_args]
-            for future in futures:
-                future.result()
-        zip_pdfs(output_dir, pdf_prefix=pdf_prefix)
+    # Workers start lazily from job threads, so spawn them instead of forking a multi-threaded process
+    _PDF_POOL = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context('spawn'))
+    try:
+        process_configs(configs, base_url, token, args.output_dir, incremental=args.incremental)
+    finally:
+        _PDF_POOL.shutdown()
 
 if __name__ == '__main__':
     main()